@@ -1,19 +1,41 @@
+from collections import OrderedDict
+from contextlib import asynccontextmanager
 from fastapi import FastAPI, Request, Form
-from fastapi.responses import HTMLResponse
+from fastapi.responses import HTMLResponse, JSONResponse
 from fastapi.staticfiles import StaticFiles
 from fastapi.templating import Jinja2Templates
-import json
-from mdmodels import SolventModel, get_solvent_from_pubchem, solvent_similarity
+import orjson
+from mdmodels import row_from_dict, get_solvent_from_pubchem, solvent_similarity, build_db_matrix, load_db_snapshot, make_session
 
-app = FastAPI()
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Shared HTTP session for all PubChem requests
+    app.state.session = make_session()
+    yield
+    await app.state.session.close()
+
+app = FastAPI(lifespan=lifespan)
 
 # Templates and static files
 app.mount("/static", StaticFiles(directory="static"), name="static")
 templates = Jinja2Templates(directory="templates")
 
-# Load the local database
-with open("solvents_db.json", encoding="utf-8") as f:
-    db = [SolventModel(**entry) for entry in json.load(f)]
+# Load the local database: the binary snapshot skips JSON parsing and
+# Pydantic validation, the JSON file remains as fallback
+snapshot = load_db_snapshot()
+if snapshot:
+    db, db_matrix = snapshot
+else:
+    with open("solvents_db.json", encoding="utf-8") as f:
+        db = [row_from_dict(entry) for entry in orjson.loads(f.read())]
+    # Precomputed struct-of-arrays matrix for vectorized similarity scoring
+    db_matrix = build_db_matrix(db)
+
+# Warm the Numba JIT (if installed) so the first request does not pay compile
+# time, and verify the scoring path: the reference must score 1.0 against itself
+if db:
+    warm = solvent_similarity(db[0], db, top_n=1, db_matrix=db_matrix)
+    assert warm and abs(warm[0][1] - 1.0) < 1e-6, f"similarity self-check failed: {warm}"
 
 # Neue PARAMS-Liste ohne die entfernten Felder
 PARAMS = [
@@ -24,26 +46,59 @@ PARAMS = [
 def get_attr(obj, key):
     return getattr(obj, key, "")
 
+# Memoized results per (reference, weights) combination: resubmitting the
+# same solvent with the same sliders is common when users refine weights
+_SIM_CACHE_MAX = 256
+_sim_cache = OrderedDict()
+
+def _sim_cache_get(key):
+    if key not in _sim_cache:
+        return None
+    _sim_cache.move_to_end(key)
+    return _sim_cache[key]
+
+def _sim_cache_put(key, results):
+    _sim_cache[key] = results
+    if len(_sim_cache) > _SIM_CACHE_MAX:
+        _sim_cache.popitem(last=False)
+
 @app.get("/", response_class=HTMLResponse)
 def index(request: Request):
     weights = {p: 0 for p in PARAMS}
     # water_solubility als Checkbox-Status (default: anzeigen)
     return templates.TemplateResponse("index.html", {"request": request, "results": None, "ref_name": "", "weights": weights, "get_attr": get_attr, "show_water_solubility": True})
 
-@app.post("/similarity", response_class=HTMLResponse)
-async def similarity(request: Request):
-    form = await request.form()
-    ref_name = form.get("ref_name", "")
+def _parse_weights(form):
     weights = {}
     for p in PARAMS:
         try:
             weights[p] = int(form.get(f"w_{p}", 1))
         except Exception:
             weights[p] = 1
+    return weights
+
+async def _find_alternatives(request: Request, ref_name: str, weights: dict):
+    """Shared scoring path for the HTML and JSON endpoints; None if the
+    reference solvent cannot be resolved."""
+    cache_key = (ref_name.strip().lower(), tuple(sorted(weights.items())))
+    results = _sim_cache_get(cache_key)
+    if results is None:
+        ref = await get_solvent_from_pubchem(request.app.state.session, ref_name)
+        if not ref:
+            return None
+        results = solvent_similarity(ref, db, top_n=10, weights=weights, db_matrix=db_matrix)
+        _sim_cache_put(cache_key, results)
+    return results
+
+@app.post("/similarity", response_class=HTMLResponse)
+async def similarity(request: Request):
+    form = await request.form()
+    ref_name = form.get("ref_name", "")
+    weights = _parse_weights(form)
     # Checkbox für water_solubility
     show_water_solubility = form.get("show_water_solubility") == "on"
-    ref = get_solvent_from_pubchem(ref_name)
-    if not ref:
+    results = await _find_alternatives(request, ref_name, weights)
+    if results is None:
         return templates.TemplateResponse(
             "index.html",
             {
@@ -56,7 +111,6 @@ async def similarity(request: Request):
                 "show_water_solubility": show_water_solubility
             }
         )
-    results = solvent_similarity(ref, db, top_n=10, weights=weights)
     return templates.TemplateResponse(
         "index.html",
         {
@@ -68,4 +122,27 @@ async def similarity(request: Request):
             "get_attr": get_attr,
             "show_water_solubility": show_water_solubility
         }
-    ) 
\ No newline at end of file
+    )
+
+@app.post("/similarity.json")
+async def similarity_json(request: Request):
+    # Lightweight endpoint for partial result reloads from the frontend:
+    # skips the Jinja render and returns only the result rows
+    form = await request.form()
+    ref_name = form.get("ref_name", "")
+    weights = _parse_weights(form)
+    results = await _find_alternatives(request, ref_name, weights)
+    if results is None:
+        return JSONResponse({"error": f"Could not find '{ref_name}'."}, status_code=404)
+    return JSONResponse({
+        "results": [
+            {
+                "name": c.name,
+                "score": round(s, 3),
+                "formula": c.molecular_formula,
+                "smiles": c.smiles,
+                "properties": {p: get_attr(c, p) for p in PARAMS + ['water_solubility_text']}
+            }
+            for c, s in results
+        ]
+    })
\ No newline at end of file
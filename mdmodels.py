@@ -1,7 +1,23 @@
+from collections import deque
+from dataclasses import dataclass
 from pydantic import BaseModel
-from typing import Optional, List, Tuple, Union
-import requests
+from typing import Optional, List, Tuple
+import asyncio
+import hashlib
+import math
+import os
+import pickle
+import re
+import time
+import aiohttp
 import numpy as np
+import orjson
+
+try:
+    from numba import njit, prange
+    HAS_NUMBA = True
+except ImportError:
+    HAS_NUMBA = False
 
 class SolventModel(BaseModel):
     """
@@ -14,7 +30,7 @@ class SolventModel(BaseModel):
     melting_point: Optional[float] 
     density: Optional[float]
     vapor_pressure: Optional[float]
-    water_solubility: Optional[Union[float, str]]
+    water_solubility: Optional[float]
     dipole_moment: Optional[float]
     dielectric_constant: Optional[float]
     logP: Optional[float]
@@ -26,14 +42,153 @@ class SolventModel(BaseModel):
     pKa: Optional[float]
     pKb: Optional[float]
     pKw: Optional[float]
+    # Raw PubChem solubility string ("Miscible", "10 mg/mL", ...) for display
+    water_solubility_text: Optional[str] = None
+
+@dataclass(slots=True)
+class SolventRow:
+    """
+    Lightweight row type for the local database: same fields as SolventModel,
+    but plain slot-based attribute access without Pydantic validation.
+    SolventModel stays reserved for PubChem ingress.
+    """
+    name: str
+    molecular_formula: Optional[str]
+    molar_mass: Optional[float]
+    boiling_point: Optional[float]
+    melting_point: Optional[float]
+    density: Optional[float]
+    vapor_pressure: Optional[float]
+    water_solubility: Optional[float]
+    dipole_moment: Optional[float]
+    dielectric_constant: Optional[float]
+    logP: Optional[float]
+    smiles: Optional[str]
+    refractive_index: Optional[float]
+    flash_point: Optional[float]
+    heat_capacity: Optional[float]
+    viscosity: Optional[float]
+    pKa: Optional[float]
+    pKb: Optional[float]
+    pKw: Optional[float]
+    water_solubility_text: Optional[str] = None
+
+def row_from_dict(entry: dict) -> SolventRow:
+    """
+    Builds a SolventRow from a raw DB dict, migrating entries written
+    before water_solubility was split into a numeric and a text field.
+
+    Args:
+        entry (dict): Raw row dict from the DB file or snapshot.
+
+    Returns:
+        SolventRow: The row with water_solubility numeric.
+    """
+    ws = entry.get("water_solubility")
+    if isinstance(ws, str):
+        entry = dict(entry)
+        entry["water_solubility"] = _parse_float(ws)
+        entry.setdefault("water_solubility_text", ws)
+    return SolventRow(**entry)
 
 PUBCHEM_BASE = "https://pubchem.ncbi.nlm.nih.gov/rest/pug"
 
-def get_cid(identifier: str) -> Optional[int]:
+def make_session() -> aiohttp.ClientSession:
+    """
+    Creates the shared aiohttp session for PubChem access.
+
+    Keeps up to 20 pooled keep-alive connections to the PubChem host so
+    repeated requests skip the TCP + TLS handshake, and sets a default
+    timeout and User-Agent.
+
+    Returns:
+        aiohttp.ClientSession: The configured session.
+    """
+    return aiohttp.ClientSession(
+        connector=aiohttp.TCPConnector(limit=20, limit_per_host=20),
+        timeout=aiohttp.ClientTimeout(total=10),
+        headers={"User-Agent": "solvent_alternative_finder"},
+    )
+
+_FLOAT_RE = re.compile(r"[-+]?[0-9]*\.?[0-9]+")
+
+def _parse_float(val) -> Optional[float]:
+    """
+    Extracts the first number from a PubChem value string like "78.37 °C".
+
+    Args:
+        val: Raw value string (or None).
+
+    Returns:
+        Optional[float]: Parsed number, otherwise None.
+    """
+    if val is None:
+        return None
+    try:
+        m = _FLOAT_RE.search(val)
+        return float(m.group()) if m else None
+    except Exception:
+        return None
+
+CACHE_DIR = "cache"
+CACHE_TTL = 30 * 86400  # 30 days, experimental data on PubChem rarely changes
+
+def _cache_path(identifier: str) -> str:
+    key = hashlib.sha1(identifier.strip().lower().encode("utf-8")).hexdigest()
+    return os.path.join(CACHE_DIR, f"{key}.json")
+
+def _cache_load(identifier: str) -> Optional[SolventModel]:
+    """
+    Loads a cached SolventModel for an identifier, if present and not expired.
+
+    Args:
+        identifier (str): Compound name or CAS number.
+
+    Returns:
+        Optional[SolventModel]: Cached model, otherwise None.
+    """
+    try:
+        with open(_cache_path(identifier), "rb") as f:
+            entry = orjson.loads(f.read())
+    except (OSError, ValueError):
+        return None
+    if time.time() - entry.get("fetched_at", 0) > CACHE_TTL:
+        return None
+    return SolventModel(**entry["solvent"])
+
+def _cache_store(identifier: str, solvent: SolventModel) -> None:
+    """
+    Writes a SolventModel to the on-disk cache.
+
+    Args:
+        identifier (str): Compound name or CAS number.
+        solvent (SolventModel): Model to cache.
+    """
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    with open(_cache_path(identifier), "wb") as f:
+        f.write(orjson.dumps({"fetched_at": time.time(), "solvent": solvent.model_dump()}))
+
+# Only request the most reliable properties
+PROPERTY_FIELDS = [
+    "MolecularFormula",
+    "MolecularWeight",
+    "XLogP",
+    "IsomericSMILES",
+    "CanonicalSMILES"
+]
+
+# PubChem accepts up to a few hundred CIDs per property request
+PROPERTY_BATCH_SIZE = 100
+
+# PubChem allows ~5 requests/second
+MAX_CONCURRENT = 5
+
+async def get_cid(session: aiohttp.ClientSession, identifier: str) -> Optional[int]:
     """
     Get the PubChem CID for a compound name or CAS number.
 
     Args:
+        session (aiohttp.ClientSession): Session for the PubChem requests.
         identifier (str): Compound name or CAS number.
 
     Returns:
@@ -41,59 +196,80 @@ def get_cid(identifier: str) -> Optional[int]:
     """
     for namespace in ["name", "rn"]:
         url = f"{PUBCHEM_BASE}/compound/{namespace}/{identifier}/cids/JSON"
-        r = requests.get(url)
-        if r.ok:
-            data = r.json()
-            cids = data.get("IdentifierList", {}).get("CID", [])
-            if cids:
-                return cids[0]
-        else:
-            print(f"Error response: {r.status_code}")
+        async with session.get(url) as r:
+            if r.ok:
+                data = orjson.loads(await r.read())
+                cids = data.get("IdentifierList", {}).get("CID", [])
+                if cids:
+                    return cids[0]
+            else:
+                print(f"Error response: {r.status}")
     return None
 
-def get_solvent_from_pubchem(identifier: str) -> Optional[SolventModel]:
+async def _fetch_computed_properties(session: aiohttp.ClientSession, cid: int) -> Optional[dict]:
+    """
+    Fetches the computed property record for a CID from PubChem.
+
+    Args:
+        session (aiohttp.ClientSession): Session for the PubChem requests.
+        cid (int): PubChem Compound ID (CID).
+
+    Returns:
+        Optional[dict]: Property dict from the PropertyTable, otherwise None.
+    """
+    url = f"{PUBCHEM_BASE}/compound/cid/{cid}/property/{','.join(PROPERTY_FIELDS)}/JSON"
+    async with session.get(url) as r:
+        if not r.ok:
+            print(f"Error in property response: {await r.text()}")
+            return None
+        data = orjson.loads(await r.read())
+    props = data.get("PropertyTable", {}).get("Properties", [{}])[0]
+    if not props:
+        print(f"No properties found in response: {data}")
+        return None
+    return props
+
+async def get_solvent_from_pubchem(session: aiohttp.ClientSession, identifier: str) -> Optional[SolventModel]:
     """
     Fetches solvent parameters from PubChem and returns a SolventModel.
 
     Args:
+        session (aiohttp.ClientSession): Session for the PubChem requests.
         identifier (str): Compound name or CAS number.
 
     Returns:
         Optional[SolventModel]: SolventModel instance if found, otherwise None.
     """
-    cid = get_cid(identifier)
+    cached = _cache_load(identifier)
+    if cached:
+        return cached
+    cid = await get_cid(session, identifier)
     if not cid:
         print(f"No CID found for '{identifier}'.")
         return None
-    # Only request the most reliable properties
-    property_fields = [
-        "MolecularFormula",
-        "MolecularWeight",
-        "XLogP",
-        "IsomericSMILES",
-        "CanonicalSMILES"
-    ]
-    url = f"{PUBCHEM_BASE}/compound/cid/{cid}/property/{','.join(property_fields)}/JSON"
-    r = requests.get(url)
-    if not r.ok:
-        print(f"Error in property response: {r.text}")
-        return None
-    props = r.json().get("PropertyTable", {}).get("Properties", [{}])[0]
+    # Fetch computed and experimental values concurrently
+    props, exp = await asyncio.gather(
+        _fetch_computed_properties(session, cid),
+        get_experimental_properties_from_pubchem(session, cid)
+    )
     if not props:
-        print(f"No properties found in response: {r.json()}")
         return None
-    # Fetch experimental values
-    exp = get_experimental_properties_from_pubchem(cid)
-    def parse_float(val):
-        if val is None:
-            return None
-        try:
-            import re
-            m = re.search(r"[-+]?[0-9]*\.?[0-9]+", val)
-            return float(m.group()) if m else None
-        except Exception:
-            return None
+    solvent = _build_solvent_model(identifier, props, exp)
+    _cache_store(identifier, solvent)
+    return solvent
+
+def _build_solvent_model(identifier: str, props: dict, exp: dict) -> SolventModel:
+    """
+    Assembles a SolventModel from computed and experimental PubChem records.
 
+    Args:
+        identifier (str): Compound name or CAS number.
+        props (dict): Property dict from the PropertyTable.
+        exp (dict): Experimental values from the PUG-View record.
+
+    Returns:
+        SolventModel: The assembled model.
+    """
     def get_smiles(props):
         return (
             props.get("IsomericSMILES") or
@@ -105,42 +281,220 @@ def get_solvent_from_pubchem(identifier: str) -> Optional[SolventModel]:
         name=identifier,
         molecular_formula=props.get("MolecularFormula"),
         molar_mass=props.get("MolecularWeight"),
-        boiling_point=parse_float(exp.get("Boiling Point")),
-        melting_point=parse_float(exp.get("Melting Point")),
-        density=parse_float(exp.get("Density")),
-        vapor_pressure=parse_float(exp.get("Vapor Pressure")),
-        water_solubility=exp.get("Solubility"),
-        dipole_moment=parse_float(exp.get("Dipole Moment")),
-        dielectric_constant=parse_float(exp.get("Dielectric Constant")),
+        boiling_point=_parse_float(exp.get("Boiling Point")),
+        melting_point=_parse_float(exp.get("Melting Point")),
+        density=_parse_float(exp.get("Density")),
+        vapor_pressure=_parse_float(exp.get("Vapor Pressure")),
+        water_solubility=_parse_float(exp.get("Solubility")),
+        water_solubility_text=exp.get("Solubility"),
+        dipole_moment=_parse_float(exp.get("Dipole Moment")),
+        dielectric_constant=_parse_float(exp.get("Dielectric Constant")),
         logP=props.get("XLogP"),
         smiles=get_smiles(props),
-        refractive_index=parse_float(exp.get("Refractive Index")),
-        flash_point=parse_float(exp.get("Flash Point")),
-        heat_capacity=parse_float(exp.get("Heat Capacity")),
-        viscosity=parse_float(exp.get("Viscosity")),
-        pKa=parse_float(exp.get("pKa")),
-        pKb=parse_float(exp.get("pKb")),
-        pKw=parse_float(exp.get("pKw")),
+        refractive_index=_parse_float(exp.get("Refractive Index")),
+        flash_point=_parse_float(exp.get("Flash Point")),
+        heat_capacity=_parse_float(exp.get("Heat Capacity")),
+        viscosity=_parse_float(exp.get("Viscosity")),
+        pKa=_parse_float(exp.get("pKa")),
+        pKb=_parse_float(exp.get("pKb")),
+        pKw=_parse_float(exp.get("pKw")),
     )
 
-def get_solvent_list(identifiers: list[str]) -> list[SolventModel]:
+async def get_properties_batch(session: aiohttp.ClientSession, cids: list[int]) -> dict[int, dict]:
+    """
+    Fetches computed properties for many CIDs in a single PubChem request.
+
+    Args:
+        session (aiohttp.ClientSession): Session for the PubChem requests.
+        cids (list[int]): PubChem Compound IDs.
+
+    Returns:
+        dict[int, dict]: Property dicts from the PropertyTable, keyed by CID.
+    """
+    url = f"{PUBCHEM_BASE}/compound/cid/{','.join(map(str, cids))}/property/{','.join(PROPERTY_FIELDS)}/JSON"
+    async with session.get(url) as r:
+        if not r.ok:
+            print(f"Error in batch property response: {await r.text()}")
+            return {}
+        data = orjson.loads(await r.read())
+    return {p["CID"]: p for p in data.get("PropertyTable", {}).get("Properties", [])}
+
+async def get_solvent_list(session: aiohttp.ClientSession, identifiers: list[str]) -> list[SolventModel]:
     """
     Fetches SolventModel instances for a list of names or CAS numbers.
 
+    Computed properties are fetched in batches of PROPERTY_BATCH_SIZE CIDs
+    per request; only the PUG-View experimental data is per-CID.
+
     Args:
+        session (aiohttp.ClientSession): Session for the PubChem requests.
         identifiers (list[str]): List of compound names or CAS numbers.
 
     Returns:
         list[SolventModel]: List of SolventModel instances.
     """
     result = []
+    misses = []
     for ident in identifiers:
-        sm = get_solvent_from_pubchem(ident)
-        if sm:
-            result.append(sm)
+        cached = _cache_load(ident)
+        if cached:
+            result.append(cached)
+        else:
+            misses.append(ident)
+    # Per-CID requests run concurrently but bounded to PubChem's rate limit
+    sem = asyncio.Semaphore(MAX_CONCURRENT)
+
+    async def bounded_cid(ident):
+        async with sem:
+            return await get_cid(session, ident)
+
+    async def bounded_exp(cid):
+        async with sem:
+            return await get_experimental_properties_from_pubchem(session, cid)
+
+    # Resolve all missing CIDs
+    cids = await asyncio.gather(*(bounded_cid(ident) for ident in misses))
+    resolved = [(ident, cid) for ident, cid in zip(misses, cids) if cid]
+    # Batch-fetch computed properties, PROPERTY_BATCH_SIZE CIDs per request
+    props_by_cid = {}
+    for i in range(0, len(resolved), PROPERTY_BATCH_SIZE):
+        chunk = [cid for _, cid in resolved[i:i + PROPERTY_BATCH_SIZE]]
+        props_by_cid.update(await get_properties_batch(session, chunk))
+    # Experimental data is per-CID only, so fetch those under the same limit
+    exps = await asyncio.gather(*(bounded_exp(cid) for _, cid in resolved))
+    for (ident, cid), exp in zip(resolved, exps):
+        props = props_by_cid.get(cid)
+        if not props:
+            print(f"No properties found for '{ident}' (CID {cid}).")
+            continue
+        solvent = _build_solvent_model(ident, props, exp)
+        _cache_store(ident, solvent)
+        result.append(solvent)
     return result
 
-def solvent_similarity(reference: SolventModel, candidates: List[SolventModel], top_n: int = 10, weights: dict = None) -> List[Tuple[SolventModel, float]]:
+SIMILARITY_FIELDS = [
+    'boiling_point', 'melting_point', 'density', 'vapor_pressure',
+    'dipole_moment', 'dielectric_constant', 'water_solubility',
+    'refractive_index', 'flash_point', 'heat_capacity', 'viscosity', 'pKa', 'pKb', 'pKw'
+]
+
+def build_feature_vector(solvent: SolventModel) -> np.ndarray:
+    """
+    Builds the numeric feature vector of a solvent over SIMILARITY_FIELDS.
+
+    Non-numeric or missing values (e.g. water_solubility strings like "Miscible")
+    become np.nan.
+
+    Args:
+        solvent (SolventModel): The solvent to vectorize.
+
+    Returns:
+        np.ndarray: 1D float32 array of length len(SIMILARITY_FIELDS).
+    """
+    return np.array(
+        [v if isinstance(v, (int, float)) else np.nan
+         for v in (getattr(solvent, f) for f in SIMILARITY_FIELDS)],
+        dtype=np.float32
+    )
+
+def build_db_matrix(candidates: List[SolventModel]) -> np.ndarray:
+    """
+    Builds a struct-of-arrays matrix of all candidate feature vectors.
+
+    Intended to be computed once at database load time so that
+    solvent_similarity can score all candidates with vectorized NumPy ops.
+
+    Args:
+        candidates (List[SolventModel]): List of candidate solvents.
+
+    Returns:
+        np.ndarray: 2D float32 array of shape (len(candidates), len(SIMILARITY_FIELDS)).
+    """
+    return np.array([build_feature_vector(c) for c in candidates], dtype=np.float32)
+
+# Dynamic-scaling multipliers, indexed by how far the relative deviation
+# exceeds the 10% / 20% thresholds; the thresholds are float32 like the
+# deviations so both scoring paths tier exact 10%/20% matches identically
+_DYN_MULTIPLIERS = np.array([2.0, 1.5, 1.0], dtype=np.float32)
+_THR1 = np.float32(0.1)
+_THR2 = np.float32(0.2)
+
+DB_SNAPSHOT_MATRIX = "solvents_db.npz"
+DB_SNAPSHOT_META = "solvents_meta.pkl"
+
+def save_db_snapshot(solvents: List[SolventModel]) -> None:
+    """
+    Writes a binary snapshot of the database: the precomputed feature matrix
+    as .npz and the remaining row data as pickle.
+
+    Args:
+        solvents (List[SolventModel]): The solvents to snapshot.
+    """
+    np.savez(DB_SNAPSHOT_MATRIX, matrix=build_db_matrix(solvents), fields=np.array(SIMILARITY_FIELDS))
+    with open(DB_SNAPSHOT_META, "wb") as f:
+        pickle.dump([s.model_dump() for s in solvents], f)
+
+def load_db_snapshot() -> Optional[Tuple[list, np.ndarray]]:
+    """
+    Loads the binary database snapshot, skipping JSON parsing and Pydantic
+    validation on startup.
+
+    Returns:
+        Optional[Tuple[list, np.ndarray]]: (rows, matrix) with SolventRow
+            entries, or None if the snapshot is missing or stale.
+    """
+    try:
+        data = np.load(DB_SNAPSHOT_MATRIX)
+        with open(DB_SNAPSHOT_META, "rb") as f:
+            meta = pickle.load(f)
+    except (OSError, ValueError):
+        return None
+    # Reject snapshots written with a different field layout
+    if list(data["fields"]) != SIMILARITY_FIELDS:
+        return None
+    rows = [row_from_dict(entry) for entry in meta]
+    # Older snapshots may still be float64
+    return rows, data["matrix"].astype(np.float32, copy=False)
+
+if HAS_NUMBA:
+    # No fastmath: it assumes no NaNs and would compile away the
+    # math.isnan guards that skip missing values
+    @njit(parallel=True, cache=True)
+    def _score_all(db_matrix, ref_vec, weights_vec):
+        """
+        Numba kernel: weighted normalized distance for all candidates in one sweep.
+
+        Streams one candidate row at a time instead of materializing the
+        intermediate diff/rel/weight arrays of the NumPy version.
+
+        Returns (scores, weight sums) as float64 arrays of length n_candidates.
+        """
+        n, f = db_matrix.shape
+        scores = np.empty(n, dtype=np.float64)
+        w_sums = np.empty(n, dtype=np.float64)
+        # Reference quantities are constant across candidates: 1.0 where
+        # x_ref == 0 turns the division into the plain absolute difference
+        ref_abs = np.empty(f, dtype=np.float32)
+        for j in range(f):
+            ref_abs[j] = 1.0 if ref_vec[j] == 0.0 else abs(ref_vec[j])
+        for i in prange(n):
+            dist_sum = 0.0
+            w_sum = 0.0
+            for j in range(f):
+                base_w = weights_vec[j]
+                ref_val = ref_vec[j]
+                cand_val = db_matrix[i, j]
+                if base_w > 0.0 and not math.isnan(ref_val) and not math.isnan(cand_val):
+                    rel = abs(ref_val - cand_val) / ref_abs[j]
+                    # Branchless dynamic scaling: 2.0 / 1.5 / 1.0 via bool arithmetic
+                    dyn_w = base_w * (2.0 - 0.5 * (rel > _THR1) - 0.5 * (rel > _THR2))
+                    dist_sum += dyn_w * rel
+                    w_sum += dyn_w
+            w_sums[i] = w_sum
+            scores[i] = max(0.0, 1.0 - dist_sum / w_sum) if w_sum > 0.0 else 0.0
+        return scores, w_sums
+
+def solvent_similarity(reference: SolventModel, candidates: List[SolventModel], top_n: int = 10, weights: dict = None, db_matrix: np.ndarray = None) -> List[Tuple[SolventModel, float]]:
     """
     Compares a reference solvent with a list and returns the most similar alternatives.
 
@@ -157,86 +511,103 @@ def solvent_similarity(reference: SolventModel, candidates: List[SolventModel],
         similarity = max(0, 1 - distance)
     where 1 means perfect match and 0 means no similarity.
 
+    The scoring runs as vectorized NumPy operations over the candidate matrix
+    instead of Python loops over each candidate and field.
+
     Args:
         reference (SolventModel): The reference solvent.
         candidates (List[SolventModel]): List of candidate solvents.
         top_n (int, optional): Number of top alternatives to return. Defaults to 10.
         weights (dict, optional): Weighting for each parameter. Defaults to None.
+        db_matrix (np.ndarray, optional): Precomputed matrix from build_db_matrix.
+            Built on the fly if not given.
 
     Returns:
         List[Tuple[SolventModel, float]]: List of tuples (SolventModel, similarity score), sorted by score (descending).
     """
-    fields = [
-        'boiling_point', 'melting_point', 'density', 'vapor_pressure',
-        'dipole_moment', 'dielectric_constant', 'water_solubility',
-        'refractive_index', 'flash_point', 'heat_capacity', 'viscosity', 'pKa', 'pKb', 'pKw'
-    ]
+    if not candidates:
+        return []
     if weights is None:
-        weights = {f: 1 for f in fields}
-    results = []
-    for cand in candidates:
-        dist_sum = 0.0
-        weight_sum = 0.0
-        for f in fields:
-            base_weight = weights.get(f, 0)
-            if base_weight > 0:
-                ref_val = getattr(reference, f)
-                cand_val = getattr(cand, f)
-                if isinstance(ref_val, (float, int)) and isinstance(cand_val, (float, int)):
-                    if ref_val == 0:
-                        rel_diff = abs(ref_val - cand_val)
-                    else:
-                        rel_diff = abs(ref_val - cand_val) / abs(ref_val)
-                    # Dynamic Scaling
-                    if rel_diff <= 0.1:
-                        dyn_weight = base_weight * 2
-                    elif rel_diff <= 0.2:
-                        dyn_weight = base_weight * 1.5
-                    else:
-                        dyn_weight = base_weight
-                    dist_sum += dyn_weight * rel_diff
-                    weight_sum += dyn_weight
-        if weight_sum == 0:
-            continue
-        avg_dist = dist_sum / weight_sum
-        similarity = max(0.0, 1.0 - avg_dist)
-        results.append((cand, similarity))
-    results.sort(key=lambda x: x[1], reverse=True)
-    return results[:top_n]
+        weights = {f: 1 for f in SIMILARITY_FIELDS}
+    if db_matrix is None:
+        db_matrix = build_db_matrix(candidates)
+    ref_vec = build_feature_vector(reference)
+    weights_vec = np.array([weights.get(f, 0) for f in SIMILARITY_FIELDS], dtype=np.float32)
+    # Score only the user-weighted columns and only rows that have at least
+    # one comparable value there; with few active sliders this shrinks the
+    # scored matrix considerably
+    active = np.where(weights_vec > 0)[0]
+    keep = np.where(~np.isnan(db_matrix[:, active]).all(axis=1))[0]
+    sub_matrix = np.ascontiguousarray(db_matrix[np.ix_(keep, active)])
+    ref_sub = np.ascontiguousarray(ref_vec[active])
+    w_sub = np.ascontiguousarray(weights_vec[active])
+    if HAS_NUMBA:
+        sub_sim, sub_w_sum = _score_all(sub_matrix, ref_sub, w_sub)
+    else:
+        # Reference quantities are constant across candidates: precompute
+        # |x_ref| once, with 1.0 where x_ref == 0 so that the division
+        # degenerates to the absolute difference without branching per row
+        ref_abs = np.where(ref_sub == 0, 1.0, np.abs(ref_sub))
+        rel = np.abs(sub_matrix - ref_sub) / ref_abs
+        # Dynamic Scaling as a step-table lookup instead of nested branches;
+        # NaN compares False and those cells are masked out below anyway
+        step = (rel > _THR1).astype(np.int8)
+        step += (rel > _THR2).astype(np.int8)
+        valid = ~np.isnan(rel)
+        dyn_w = w_sub * _DYN_MULTIPLIERS[step] * valid
+        rel = np.where(valid, rel, 0.0)
+        # With invalid cells zeroed, the per-candidate reduction collapses
+        # to one weighted-dot kernel over the whole matrix
+        dist_sum = np.einsum('cf,cf->c', dyn_w, rel)
+        sub_w_sum = dyn_w.sum(axis=1)
+        sub_sim = np.maximum(0.0, 1.0 - dist_sum / np.maximum(sub_w_sum, np.float32(1e-12)))
+    # Scatter back; filtered candidates sort behind every real score
+    sim = np.full(db_matrix.shape[0], -1.0, dtype=np.float32)
+    w_sum = np.zeros(db_matrix.shape[0], dtype=np.float32)
+    sim[keep] = np.where(sub_w_sum > 0, sub_sim, -1.0)
+    w_sum[keep] = sub_w_sum
+    # O(n) partial selection of the top_n scores, then sort only those
+    k = min(top_n, len(sim))
+    top_idx = np.argpartition(-sim, k - 1)[:k]
+    order = top_idx[np.argsort(-sim[top_idx])]
+    return [(candidates[i], float(sim[i])) for i in order if w_sum[i] > 0]
 
-def get_experimental_properties_from_pubchem(cid: int) -> dict:
+async def get_experimental_properties_from_pubchem(session: aiohttp.ClientSession, cid: int) -> dict:
     """
     Extracts experimental values (boiling point, melting point, density, etc.) from the PubChem Record endpoint.
 
     Args:
+        session (aiohttp.ClientSession): Session for the PubChem requests.
         cid (int): PubChem Compound ID (CID).
 
     Returns:
         dict: Dictionary of experimental property names and their values.
     """
-    import requests
-    url = f"https://pubchem.ncbi.nlm.nih.gov/rest/pug_view/data/compound/{cid}/JSON"
-    r = requests.get(url)
-    if not r.ok:
-        print(f"Error in record response: {r.text}")
-        return {}
-    data = r.json()
+    # Request only the physical-property section instead of the full record
+    # (which also carries toxicity, spectra and literature references)
+    url = f"https://pubchem.ncbi.nlm.nih.gov/rest/pug_view/data/compound/{cid}/JSON?heading=Chemical+and+Physical+Properties"
+    async with session.get(url) as r:
+        if not r.ok:
+            print(f"Error in record response: {await r.text()}")
+            return {}
+        data = orjson.loads(await r.read())
     result = {}
-    def find_properties(sections, keys):
-        for section in sections:
-            toc = section.get("TOCHeading", "")
-            if toc in keys and "Information" in section:
-                for info in section["Information"]:
-                    val = info.get("Value", {}).get("StringWithMarkup", [{}])[0].get("String")
-                    if val:
-                        result[toc] = val
-            if "Section" in section:
-                find_properties(section["Section"], keys)
-    keys = [
+    keys = frozenset([
         "Boiling Point", "Melting Point", "Density", "Refractive Index", "Solubility", "Vapor Pressure",
         "Dielectric Constant", "Dipole Moment", "Flash Point", "Autoignition Temperature",
         "Heat Capacity", "Viscosity", "pKa", "pKb", "pKw"
-    ]
-    root_sections = data.get("Record", {}).get("Section", [])
-    find_properties(root_sections, keys)
+    ])
+    # Iterative walk with an explicit stack; stop as soon as all keys are found
+    stack = deque(data.get("Record", {}).get("Section", []))
+    while stack and len(result) < len(keys):
+        section = stack.pop()
+        toc = section.get("TOCHeading", "")
+        if toc in keys and toc not in result and "Information" in section:
+            for info in section["Information"]:
+                val = info.get("Value", {}).get("StringWithMarkup", [{}])[0].get("String")
+                if val:
+                    result[toc] = val
+                    break
+        if "Section" in section:
+            stack.extend(section["Section"])
     return result 
\ No newline at end of file
@@ -1,27 +1,50 @@
-import json
-import time
-from mdmodels import get_solvent_from_pubchem
-
-# Read solvent names from a text file (one name per line)
-with open("solvents_list.txt", encoding="utf-8") as f:
-    names = [line.strip() for line in f if line.strip()]
-
-solvents = []
-for i, name in enumerate(names, 1):
-    attempt = 0
-    while attempt < 3:
-        try:
-            sm = get_solvent_from_pubchem(name)
-            if sm:
-                solvents.append(sm)
-            else:
-                print(f"  -> No data found")
-            break
-        except Exception as e:
-            attempt += 1
-            print(f"  -> Error: {e} (Attempt {attempt}/3)")
-            time.sleep(3)
-    # Save progress after each fetch
-    with open("solvents_db.json", "w", encoding="utf-8") as f:
-        json.dump([s.model_dump() for s in solvents], f, ensure_ascii=False, indent=2)
-    time.sleep(1)  # 1 second break between requests 
\ No newline at end of file
+import asyncio
+import aiohttp
+import orjson
+from mdmodels import MAX_CONCURRENT, get_solvent_from_pubchem, save_db_snapshot, make_session
+
+CHECKPOINT_EVERY = 20
+
+async def fetch_one(sem: asyncio.Semaphore, session: aiohttp.ClientSession, name: str):
+    """
+    Fetches one solvent under the shared semaphore, retrying up to 3 times.
+    """
+    async with sem:
+        for attempt in range(1, 4):
+            try:
+                return await get_solvent_from_pubchem(session, name)
+            except Exception as e:
+                print(f"{name} -> Error: {e} (Attempt {attempt}/3)")
+                await asyncio.sleep(2 ** attempt)
+    return None
+
+def save_progress(solvents):
+    with open("solvents_db.json", "wb") as f:
+        f.write(orjson.dumps([s.model_dump() for s in solvents], option=orjson.OPT_INDENT_2))
+
+async def main():
+    # Read solvent names from a text file (one name per line)
+    with open("solvents_list.txt", encoding="utf-8") as f:
+        names = [line.strip() for line in f if line.strip()]
+
+    sem = asyncio.Semaphore(MAX_CONCURRENT)
+    solvents = []
+    done = 0
+    async with make_session() as session:
+        tasks = [asyncio.create_task(fetch_one(sem, session, name)) for name in names]
+        for task in asyncio.as_completed(tasks):
+            sm = await task
+            done += 1
+            if sm:
+                solvents.append(sm)
+            else:
+                print(f"  -> No data found")
+            # Save progress in batches instead of after every single fetch
+            if done % CHECKPOINT_EVERY == 0:
+                save_progress(solvents)
+    save_progress(solvents)
+    # Binary snapshot for fast app startup
+    save_db_snapshot(solvents)
+
+if __name__ == "__main__":
+    asyncio.run(main())